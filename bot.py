@@ -4,13 +4,32 @@ Main bot file for the Wordle Discord Stats Bot
 import discord
 from discord.ext import commands
 import asyncio
+import logging
 from datetime import datetime, timedelta
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
 
 import config
 import database
 import parser
 from commands import setup_commands
 
+log = logging.getLogger(__name__)
+
+# Number of result rows written per transaction during backfill
+BACKFILL_BATCH_SIZE = 500
+
+# Maximum number of parsed messages waiting for the backfill writer; the
+# history loop pauses when the queue is full so memory stays bounded
+BACKFILL_QUEUE_SIZE = 64
+
+# Bound once so the per-message checks in on_message and backfill skip the config lookups
+_WORDLE_BOT_ID = config.WORDLE_BOT_ID
+_WORDLE_CHANNEL_ID = config.WORDLE_CHANNEL_ID
+
+# (guild_id, user_id) -> (display_name, user_id) for already resolved users
+_user_resolve_cache: dict[tuple[int, int], tuple[str, str]] = {}
+
 
 # Set up bot with intents
 intents = discord.Intents.default()
@@ -57,23 +76,32 @@ async def resolve_user_id_to_name(user_identifier: str, guild) -> tuple:
     Returns:
         Tuple of (display_name, user_id)
     """
-    # Check if it's a numeric ID
-    if user_identifier.isdigit():
+    # Check if it's a numeric ID (isascii() is a constant-time flag check, so
+    # non-ASCII usernames skip the per-character scan entirely)
+    if user_identifier.isascii() and user_identifier.isdecimal():
         try:
             user_id = int(user_identifier)
+            cache_key = (guild.id, user_id)
+
+            if cache_key in _user_resolve_cache:
+                return _user_resolve_cache[cache_key]
+
             member = guild.get_member(user_id)
 
             if member:
                 # Use display name (nickname if set, otherwise username)
-                return (member.display_name, str(user_id))
+                resolved = (member.display_name, str(user_id))
             else:
                 # Try to fetch the user if not in cache
                 try:
                     user = await bot.fetch_user(user_id)
-                    return (user.name, str(user_id))
+                    resolved = (user.name, str(user_id))
                 except:
                     # If we can't find the user, use the ID as the name
                     return (user_identifier, user_identifier)
+
+            _user_resolve_cache[cache_key] = resolved
+            return resolved
         except:
             return (user_identifier, None)
     else:
@@ -85,63 +113,53 @@ async def resolve_user_id_to_name(user_identifier: str, guild) -> tuple:
 async def on_message(message):
     """Called when a message is sent in any channel the bot can see"""
 
+    # Anything other than the Wordle bot in the Wordle channel can only be a command
+    if message.author.id != _WORDLE_BOT_ID or message.channel.id != _WORDLE_CHANNEL_ID:
+        # Bots never issue commands, so skip the prefix parsing for them
+        if message.author.bot:
+            return
+        await bot.process_commands(message)
+        return
+
     # Ignore messages from the bot itself
     if message.author.id == bot.user.id:
         return
 
-    # Check if message is from the Wordle bot in the correct channel
-    if message.author.id == config.WORDLE_BOT_ID and message.channel.id == config.WORDLE_CHANNEL_ID:
-        print(f"\n📨 Received message from Wordle bot:")
-        print(f"   Content: {message.content[:100]}...")
+    log.debug("📨 Received message from Wordle bot: %.100s", message.content)
 
-        # Try to parse the message
-        results, streak, wordle_number = parser.parse_wordle_message(message.content)
+    # Try to parse the message
+    results, streak, wordle_number = parser.parse_wordle_message(message.content)
 
-        if results and parser.validate_results(results):
-            # Get the date (assuming results are for "yesterday")
-            date = parser.get_date_from_timestamp(message.created_at, is_yesterday=True)
+    if results and parser.validate_results(results):
+        # Get the date (assuming results are for "yesterday")
+        date = parser.get_date_from_timestamp(message.created_at, is_yesterday=True)
 
-            print(f"   ✅ Parsed {len(results)} results for {date}")
-            print(f"   Streak: {streak}")
-
-            # Save each result to database
-            saved_count = 0
-            for result in results:
-                # Resolve user ID to username if needed
-                player_name, player_id = await resolve_user_id_to_name(
-                    result.player_name,
-                    message.guild
-                )
-
-                success = database.save_result(
-                    date=date,
-                    player_name=player_name,
-                    score=result.score,
-                    is_winner=result.is_winner,
-                    streak_day=streak or 0,
-                    player_id=player_id,
-                    wordle_number=wordle_number
-                )
-
-                if success:
-                    saved_count += 1
-                    print(f"      - Saved: {player_name} ({player_id if player_id else 'no ID'})")
-                else:
-                    print(f"      - Duplicate: {player_name}")
-
-            # React to the message to confirm processing
-            if saved_count > 0:
-                await message.add_reaction('✅')
-                print(f"   💾 Saved {saved_count}/{len(results)} results to database")
-            else:
-                await message.add_reaction('⚠️')
-                print(f"   ⚠️ All results were duplicates")
+        log.debug("✅ Parsed %d results for %s (streak: %s)", len(results), date, streak)
+
+        # Resolve user IDs to usernames in parallel, then save all results at once
+        resolved = await asyncio.gather(*(
+            resolve_user_id_to_name(result.player_name, message.guild)
+            for result in results
+        ))
 
+        rows = []
+        for result, (player_name, player_id) in zip(results, resolved):
+            rows.append((date, player_name, result.score, result.is_winner,
+                         streak or 0, player_id, wordle_number))
+            log.debug("   - %s (%s)", player_name, player_id or 'no ID')
+
+        saved_count = await asyncio.to_thread(database.save_results_bulk, rows)
+
+        # React to the message to confirm processing
+        if saved_count > 0:
+            await message.add_reaction('✅')
+            log.debug("💾 Saved %d/%d results to database", saved_count, len(results))
         else:
-            print(f"   ⚠️ Could not parse message or invalid results")
+            await message.add_reaction('⚠️')
+            log.debug("⚠️ All results were duplicates")
 
-    # Process commands (this must be at the end)
-    await bot.process_commands(message)
+    else:
+        log.warning("⚠️ Could not parse Wordle bot message: %.100s", message.content)
 
 
 @bot.event
@@ -162,6 +180,65 @@ async def on_command_error(ctx, error):
         await ctx.send(f"❌ An error occurred: {str(error)}")
 
 
+async def _backfill_writer(queue: asyncio.Queue) -> tuple:
+    """
+    Drain parsed backfill rows from the queue into the database
+
+    Rows are written in batches of BACKFILL_BATCH_SIZE until a None
+    sentinel is received.
+
+    Args:
+        queue: Queue of per-message row lists, terminated by None
+
+    Returns:
+        Tuple of (saved_count, duplicate_count)
+    """
+    saved = 0
+    duplicates = 0
+    pending = []
+
+    while True:
+        rows = await queue.get()
+        if rows is not None:
+            pending.extend(rows)
+
+        # Write in batches to keep the number of commits low
+        if pending and (rows is None or len(pending) >= BACKFILL_BATCH_SIZE):
+            batch_saved = await asyncio.to_thread(database.save_results_many, pending)
+            saved += batch_saved
+            duplicates += len(pending) - batch_saved
+            pending = []
+
+        if rows is None:
+            return saved, duplicates
+
+
+async def _enqueue(queue: asyncio.Queue, item, writer: asyncio.Task):
+    """
+    Put an item on the backfill queue, waiting for space if it is full
+
+    While waiting, the writer task is watched as well, so if it dies the
+    producer gets its exception instead of blocking forever on a full queue.
+
+    Args:
+        queue: The bounded backfill queue
+        item: Rows for one message, or None to signal the end
+        writer: The task draining the queue
+    """
+    if not queue.full():
+        queue.put_nowait(item)
+        return
+
+    put = asyncio.ensure_future(queue.put(item))
+    await asyncio.wait({put, writer}, return_when=asyncio.FIRST_COMPLETED)
+
+    if not put.done():
+        put.cancel()
+        # The writer stopped before making room; surface its error
+        writer.result()
+        raise RuntimeError("Backfill writer stopped unexpectedly")
+
+
 @bot.command(name='backfill')
 @commands.has_permissions(administrator=True)
 async def backfill(ctx, limit: int = 100):
@@ -171,55 +248,62 @@ async def backfill(ctx, limit: int = 100):
     Usage: !backfill [limit]
     Note: Only administrators can use this command
     """
-    if ctx.channel.id != config.WORDLE_CHANNEL_ID:
+    if ctx.channel.id != _WORDLE_CHANNEL_ID:
         await ctx.send("❌ This command can only be used in the Wordle channel!")
         return
 
     msg = await ctx.send(f"🔄 Starting backfill of up to {limit} messages...")
 
     processed = 0
-    saved = 0
-    duplicates = 0
     errors = 0
+    seen = set()
+
+    # Parsed rows are handed to a writer task so history paging and
+    # database writes overlap instead of alternating
+    queue = asyncio.Queue(maxsize=BACKFILL_QUEUE_SIZE)
+    writer = asyncio.create_task(_backfill_writer(queue))
 
     try:
         async for message in ctx.channel.history(limit=limit):
             # Only process messages from the Wordle bot
-            if message.author.id != config.WORDLE_BOT_ID:
+            if message.author.id != _WORDLE_BOT_ID:
                 continue
 
             processed += 1
 
+            # Skip non-result posts (announcements etc.) before running the parser
+            if '/6' not in message.content:
+                continue
+
+            # Skip re-posts of a result message already seen for the same day
+            date = parser.get_date_from_timestamp(message.created_at, is_yesterday=True)
+            message_key = hash((date, message.content))
+            if message_key in seen:
+                continue
+            seen.add(message_key)
+
             # Parse the message
             results, streak, wordle_number = parser.parse_wordle_message(message.content)
 
             if results and parser.validate_results(results):
-                date = parser.get_date_from_timestamp(message.created_at, is_yesterday=True)
-
-                for result in results:
-                    # Resolve user ID to username if needed
-                    player_name, player_id = await resolve_user_id_to_name(
-                        result.player_name,
-                        ctx.guild
-                    )
-
-                    success = database.save_result(
-                        date=date,
-                        player_name=player_name,
-                        score=result.score,
-                        is_winner=result.is_winner,
-                        streak_day=streak or 0,
-                        player_id=player_id,
-                        wordle_number=wordle_number
-                    )
-
-                    if success:
-                        saved += 1
-                    else:
-                        duplicates += 1
+                # Resolve user IDs to usernames in parallel
+                resolved = await asyncio.gather(*(
+                    resolve_user_id_to_name(result.player_name, ctx.guild)
+                    for result in results
+                ))
+
+                await _enqueue(queue, [
+                    (date, player_name, result.score, result.is_winner,
+                     streak or 0, player_id, wordle_number)
+                    for result, (player_name, player_id) in zip(results, resolved)
+                ], writer)
             else:
-                if '/6' in message.content:  # Only count as error if it looks like a result
-                    errors += 1
+                # It looked like a result but couldn't be parsed
+                errors += 1
+
+        # Signal the writer that history is exhausted and wait for it to flush
+        await _enqueue(queue, None, writer)
+        saved, duplicates = await writer
 
         # Update the message with results
         await msg.edit(
@@ -231,8 +315,9 @@ async def backfill(ctx, limit: int = 100):
         )
 
     except Exception as e:
+        writer.cancel()
         await msg.edit(content=f"❌ Backfill failed: {str(e)}")
-        print(f"Backfill error: {e}")
+        log.exception("Backfill failed")
 
 
 @bot.command(name='dbstats')
@@ -242,27 +327,8 @@ async def db_stats(ctx):
 
     Usage: !dbstats
     """
-    import sqlite3
-    conn = sqlite3.connect(config.DATABASE_PATH)
-    c = conn.cursor()
-
-    # Get total results
-    c.execute('SELECT COUNT(*) FROM results')
-    total_results = c.fetchone()[0]
-
-    # Get unique players
-    c.execute('SELECT COUNT(DISTINCT player_name) FROM results')
-    unique_players = c.fetchone()[0]
-
-    # Get date range
-    c.execute('SELECT MIN(date), MAX(date) FROM results')
-    min_date, max_date = c.fetchone()
-
-    # Get total days tracked
-    c.execute('SELECT COUNT(DISTINCT date) FROM results')
-    total_days = c.fetchone()[0]
-
-    conn.close()
+    summary = await asyncio.to_thread(database.get_database_summary)
+    total_results, unique_players, min_date, max_date, total_days = summary
 
     embed = discord.Embed(
         title="📊 Database Statistics",
@@ -298,19 +364,7 @@ async def list_players(ctx):
 
     Usage: !players
     """
-    import sqlite3
-    conn = sqlite3.connect(config.DATABASE_PATH)
-    c = conn.cursor()
-
-    c.execute('''
-        SELECT DISTINCT player_name, COUNT(*) as games
-        FROM results
-        GROUP BY player_name
-        ORDER BY games DESC
-    ''')
-
-    players = c.fetchall()
-    conn.close()
+    players = await asyncio.to_thread(database.get_player_game_counts)
 
     if not players:
         await ctx.send("No players found in database!")
@@ -339,8 +393,34 @@ async def list_players(ctx):
     await ctx.send(embed=embed)
 
 
+def setup_logging() -> QueueListener:
+    """
+    Configure logging so records are formatted and written on a background thread
+
+    The event loop only pushes records onto a queue; a QueueListener thread
+    does the formatting and the (blocking) stream writes.
+
+    Returns:
+        The started QueueListener (stop it on shutdown to flush)
+    """
+    log_queue = SimpleQueue()
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    listener = QueueListener(log_queue, handler)
+
+    root = logging.getLogger()
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(config.LOG_LEVEL)
+
+    listener.start()
+    return listener
+
+
 def main():
     """Main entry point"""
+    listener = setup_logging()
+
     print("=" * 50)
     print("🤖 Wordle Discord Stats Bot")
     print("=" * 50)
@@ -352,11 +432,15 @@ def main():
     # Start the bot
     print("🚀 Starting bot...")
     try:
-        bot.run(config.DISCORD_BOT_TOKEN)
+        # Logging is already configured above, so don't let discord.py add its own handler
+        bot.run(config.DISCORD_BOT_TOKEN, log_handler=None)
     except discord.LoginFailure:
         print("❌ Failed to login. Check your DISCORD_BOT_TOKEN in .env")
     except Exception as e:
         print(f"❌ Error starting bot: {e}")
+    finally:
+        database.close_pool()
+        listener.stop()
 
 
 if __name__ == "__main__":
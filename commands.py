@@ -1,13 +1,25 @@
 """
 Bot commands for the Wordle Discord Stats Bot
 """
+import asyncio
 import discord
 from discord.ext import commands
+from collections import defaultdict
 import database
 import visualizations
 from typing import Optional
 
 
+# Display labels for stored scores (7 is a failed X/6) and the winner crown
+_SCORE_LABEL = {1: '1', 2: '2', 3: '3', 4: '4', 5: '5', 6: '6', 7: 'X'}
+_CROWN = ('', '👑 ')
+
+
+def _clean(name: str) -> str:
+    """Strip a leading @ from a player name argument"""
+    return name[1:] if name.startswith('@') else name
+
+
 def setup_commands(bot: commands.Bot):
     """Register all bot commands"""
 
@@ -19,7 +31,7 @@ def setup_commands(bot: commands.Bot):
         Usage: !leaderboard [limit]
         Example: !leaderboard 5
         """
-        data = database.get_leaderboard(limit)
+        data = await asyncio.to_thread(database.get_leaderboard, limit)
 
         if not data:
             await ctx.send("No data available yet! Play some Wordle first!")
@@ -56,9 +68,9 @@ def setup_commands(bot: commands.Bot):
             player_name = ctx.author.name
         else:
             # Clean up the player name
-            player_name = player.lstrip('@')
+            player_name = _clean(player)
 
-        stats_data = database.get_player_stats(player_name)
+        stats_data = await asyncio.to_thread(database.get_player_stats, player_name)
 
         if not stats_data:
             await ctx.send(f"No stats found for **{player_name}**. Have they played any Wordle?")
@@ -98,8 +110,7 @@ def setup_commands(bot: commands.Bot):
         for score in range(1, 8):
             count = stats_data['score_distribution'].get(score, 0)
             if count > 0:
-                label = 'X' if score == 7 else str(score)
-                dist_str.append(f"{label}/6: {count}")
+                dist_str.append(f"{_SCORE_LABEL[score]}/6: {count}")
 
         if dist_str:
             embed.add_field(
@@ -117,7 +128,7 @@ def setup_commands(bot: commands.Bot):
 
         Usage: !average
         """
-        data = database.get_all_players_averages()
+        data = await asyncio.to_thread(database.get_all_players_averages)
 
         if not data:
             await ctx.send("No data available yet!")
@@ -146,7 +157,7 @@ def setup_commands(bot: commands.Bot):
 
         Usage: !streak
         """
-        streak_data = database.get_streak_info()
+        streak_data = await asyncio.to_thread(database.get_streak_info)
 
         embed = discord.Embed(
             title="🔥 Streak Information",
@@ -176,10 +187,10 @@ def setup_commands(bot: commands.Bot):
         Example: !h2h @Soham_c.7 @kashyapwho
         """
         # Clean player names
-        p1 = player1.lstrip('@')
-        p2 = player2.lstrip('@')
+        p1 = _clean(player1)
+        p2 = _clean(player2)
 
-        h2h_data = database.get_head_to_head(p1, p2)
+        h2h_data = await asyncio.to_thread(database.get_head_to_head, p1, p2)
 
         if not h2h_data:
             await ctx.send(f"Not enough data to compare **{p1}** and **{p2}**")
@@ -230,7 +241,7 @@ def setup_commands(bot: commands.Bot):
         Usage: !luck [limit]
         Example: !luck 5
         """
-        data = database.get_lucky_players()
+        data = await asyncio.to_thread(database.get_lucky_players)
 
         if not data:
             await ctx.send("No lucky scores yet!")
@@ -259,7 +270,7 @@ def setup_commands(bot: commands.Bot):
 
         Usage: !whowins
         """
-        weekday_data = database.get_weekday_winners()
+        weekday_data = await asyncio.to_thread(database.get_weekday_winners)
 
         if not weekday_data:
             await ctx.send("Not enough data yet!")
@@ -293,19 +304,19 @@ def setup_commands(bot: commands.Bot):
 
         try:
             if chart_type in ['leaderboard', 'wins', 'lb']:
-                chart_buf = visualizations.create_wins_leaderboard_chart()
+                chart_buf = await visualizations.create_wins_leaderboard_chart_async()
                 title = "Wins Leaderboard"
 
             elif chart_type in ['average', 'avg', 'averages']:
-                chart_buf = visualizations.create_average_scores_chart()
+                chart_buf = await visualizations.create_average_scores_chart_async()
                 title = "Average Scores"
 
             elif chart_type in ['luck', 'lucky']:
-                chart_buf = visualizations.create_luck_chart()
+                chart_buf = await visualizations.create_luck_chart_async()
                 title = "Luckiest Players"
 
             elif chart_type in ['participation', 'part', 'days']:
-                chart_buf = visualizations.create_participation_chart()
+                chart_buf = await visualizations.create_participation_chart_async()
                 title = "Participation Rate"
 
             else:
@@ -333,10 +344,10 @@ def setup_commands(bot: commands.Bot):
         if player is None:
             player_name = ctx.author.name
         else:
-            player_name = player.lstrip('@')
+            player_name = _clean(player)
 
         try:
-            chart_buf = visualizations.create_score_distribution_chart(player_name)
+            chart_buf = await visualizations.create_score_distribution_chart_async(player_name)
             file = discord.File(chart_buf, filename=f'{player_name}_distribution.png')
             await ctx.send(f"📊 **Score Distribution for {player_name}**", file=file)
 
@@ -351,11 +362,11 @@ def setup_commands(bot: commands.Bot):
         Usage: !charth2h @player1 @player2
         Example: !charth2h @Soham_c.7 @kashyapwho
         """
-        p1 = player1.lstrip('@')
-        p2 = player2.lstrip('@')
+        p1 = _clean(player1)
+        p2 = _clean(player2)
 
         try:
-            chart_buf = visualizations.create_head_to_head_chart(p1, p2)
+            chart_buf = await visualizations.create_head_to_head_chart_async(p1, p2)
             file = discord.File(chart_buf, filename=f'{p1}_vs_{p2}.png')
             await ctx.send(f"⚔️ **{p1} vs {p2}**", file=file)
 
@@ -370,18 +381,17 @@ def setup_commands(bot: commands.Bot):
         Usage: !history [days]
         Example: !history 5
         """
-        results = database.get_recent_results(days)
+        results = await asyncio.to_thread(database.get_recent_results, days)
 
         if not results:
             await ctx.send("No recent results found!")
             return
 
         # Group by date
-        from collections import defaultdict
         by_date = defaultdict(list)
 
         for result in results:
-            by_date[result['date']].append(result)
+            by_date[result.date].append(result)
 
         embed = discord.Embed(
             title=f"📜 Last {min(days, len(by_date))} Days",
@@ -390,16 +400,12 @@ def setup_commands(bot: commands.Bot):
 
         # Show most recent days first
         for date in sorted(by_date.keys(), reverse=True)[:days]:
-            day_results = by_date[date]
-
-            # Sort by score
-            day_results.sort(key=lambda x: x['score'])
-
+            # Results arrive already sorted by score
             result_lines = []
-            for r in day_results:
-                score_str = 'X' if r['score'] == 7 else str(r['score'])
-                winner_mark = '👑 ' if r['is_winner'] else ''
-                result_lines.append(f"{winner_mark}{r['player_name']}: {score_str}/6")
+            for r in by_date[date]:
+                result_lines.append(
+                    f"{_CROWN[r.is_winner]}{r.player_name}: {_SCORE_LABEL[r.score]}/6"
+                )
 
             embed.add_field(
                 name=date,
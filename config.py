@@ -2,6 +2,7 @@
     Configuration and constants for the Wordle Discord Bot
 """
 import os
+import re
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -15,13 +16,16 @@ WORDLE_BOT_ID = int(os.getenv('WORDLE_BOT_ID', 903698786472009758))
  # Bot Configuration
 COMMAND_PREFIX = os.getenv('COMMAND_PREFIX', '!')
 
+ # Logging level (set to DEBUG to log every parsed Wordle message)
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+
  # Database Configuration
 DATABASE_PATH = os.getenv('DATABASE_PATH', 'wordle_stats.db')
 
  # Constants
 CROWN_EMOJI = '👑'
-SCORE_PATTERN = r'([👑]?\s*)?([X\d])/6:\s*(@[\w.]+(?:\s+@[\w.]+)*)'
-STREAK_PATTERN = r'(\d+)\s+day\s+streak'
+SCORE_RE = re.compile(r'([👑]?\s*)?([X\d])/6:\s*(@[\w.]+(?:\s+@[\w.]+)*)')
+STREAK_RE = re.compile(r'(\d+)\s+day\s+streak')
 
  # Score mapping (X/6 is stored as 7 for failed attempts)
 FAIL_SCORE = 7
@@ -2,14 +2,107 @@
 Database operations for the Wordle Discord Stats Bot
 """
 import sqlite3
+import threading
+import time
+from collections import namedtuple
 from datetime import datetime
-from typing import List, Tuple, Optional
+from typing import Any, Callable, Dict, List, Tuple, Optional
 from config import DATABASE_PATH
 
+# Seconds a cached query result stays valid
+CACHE_TTL = 60
+
+# Rows per multi-row INSERT in save_results_many(). Each row binds 8 parameters, and
+# SQLite before 3.32 caps a statement at 999 of them
+INSERT_CHUNK_SIZE = 500 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999 // 8
+
+# Per-thread connections, created lazily by get_conn()
+_local = threading.local()
+_conns: List[sqlite3.Connection] = []
+_conns_lock = threading.Lock()
+
+# Cached query results: key -> (stored_at, value)
+_cache: Dict[tuple, Tuple[float, Any]] = {}
+
+# Set once init_database() has run in this process
+_initialized = False
+
+# One row of the results table
+Result = namedtuple('Result', ['id', 'date', 'wordle_number', 'player_name', 'player_id',
+                               'score', 'is_winner', 'streak_day', 'created_at', 'weekday'])
+
+
+def get_conn() -> sqlite3.Connection:
+    """
+    Get the calling thread's long-lived database connection
+
+    Each thread (the event loop and the asyncio.to_thread workers) gets its
+    own connection, opened on first use and tuned once, so callers keep
+    SQLite's page cache warm without sharing a connection across threads.
+
+    Returns:
+        The thread's sqlite3 connection
+    """
+    conn = getattr(_local, 'conn', None)
+
+    if conn is None:
+        # check_same_thread is off only so close_pool() can close it at shutdown
+        conn = sqlite3.connect(DATABASE_PATH, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA cache_size=-20000')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA mmap_size=268435456')
+        _local.conn = conn
+
+        with _conns_lock:
+            _conns.append(conn)
+
+    return conn
+
+
+def close_pool():
+    """Close every connection opened by get_conn() (call on shutdown)"""
+    with _conns_lock:
+        for conn in _conns:
+            conn.close()
+        _conns.clear()
+
+
+def _cached(key: tuple, fn: Callable[[], Any], ttl: float = CACHE_TTL) -> Any:
+    """
+    Return a cached query result, running fn() if it is missing or expired
+
+    Args:
+        key: Cache key identifying the query and its arguments
+        fn: Function that runs the query
+        ttl: Seconds the result stays valid
+
+    Returns:
+        The (possibly cached) query result
+    """
+    now = time.monotonic()
+    hit = _cache.get(key)
+    if hit is not None and now - hit[0] < ttl:
+        return hit[1]
+
+    value = fn()
+    _cache[key] = (now, value)
+    return value
+
+
+def clear_cache():
+    """Drop all cached query results (called after new results are saved)"""
+    _cache.clear()
+
 
 def init_database():
-    """Initialize the SQLite database with the required schema"""
-    conn = sqlite3.connect(DATABASE_PATH)
+    """Initialize the SQLite database with the required schema (once per process)"""
+    global _initialized
+    if _initialized:
+        return
+
+    conn = get_conn()
     c = conn.cursor()
 
     c.execute('''
@@ -20,23 +113,44 @@ def init_database():
             player_name TEXT NOT NULL,
             player_id TEXT,
             score INTEGER NOT NULL,
-            is_winner BOOLEAN DEFAULT FALSE,
+            is_winner INTEGER NOT NULL DEFAULT 0,
             streak_day INTEGER,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            weekday INTEGER,
             UNIQUE(date, player_name)
         )
     ''')
 
+    # Databases created before the weekday column existed need it added and filled in
+    columns = {row[1] for row in c.execute('PRAGMA table_info(results)')}
+    if 'weekday' not in columns:
+        c.execute('ALTER TABLE results ADD COLUMN weekday INTEGER')
+    c.execute("UPDATE results SET weekday = CAST(strftime('%w', date) AS INTEGER) WHERE weekday IS NULL")
+
     # Create indexes for better query performance
-    c.execute('CREATE INDEX IF NOT EXISTS idx_date ON results(date)')
-    c.execute('CREATE INDEX IF NOT EXISTS idx_player_name ON results(player_name)')
-    c.execute('CREATE INDEX IF NOT EXISTS idx_is_winner ON results(is_winner)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_date_score ON results(date DESC, score)')
+    c.execute('DROP INDEX IF EXISTS idx_date')  # Superseded by idx_date_score
+    c.execute('CREATE INDEX IF NOT EXISTS idx_player_score ON results(player_name, score, is_winner)')
+    c.execute('DROP INDEX IF EXISTS idx_player_name')  # Prefix of idx_player_score
+    c.execute('CREATE INDEX IF NOT EXISTS idx_player_date ON results(player_name, date)')
+    # Partial index holding only winning rows, for the wins leaderboard. is_winner is
+    # constant inside it but listed so SQLite treats the index as covering
+    c.execute('CREATE INDEX IF NOT EXISTS idx_winners ON results(player_name, is_winner) WHERE is_winner = 1')
+    c.execute('DROP INDEX IF EXISTS idx_is_winner')  # Superseded by idx_winners
+    c.execute('DROP INDEX IF EXISTS idx_player_winner')  # Superseded by idx_winners and idx_player_date
+    c.execute('CREATE INDEX IF NOT EXISTS idx_weekday_winner ON results(weekday, is_winner, player_name)')
 
     conn.commit()
-    conn.close()
+    c.close()
+    _initialized = True
     print(f"✅ Database initialized at {DATABASE_PATH}")
 
 
+def _weekday(date: str) -> int:
+    """Weekday number for a YYYY-MM-DD date, Sunday = 0 (same as strftime('%w'))"""
+    return (datetime.strptime(date, '%Y-%m-%d').weekday() + 1) % 7
+
+
 def save_result(date: str, player_name: str, score: int, is_winner: bool,
                 streak_day: int, player_id: Optional[str] = None,
                 wordle_number: Optional[int] = None) -> bool:
@@ -55,110 +169,236 @@ def save_result(date: str, player_name: str, score: int, is_winner: bool,
     Returns:
         True if saved successfully, False if duplicate
     """
-    conn = sqlite3.connect(DATABASE_PATH)
-    c = conn.cursor()
+    # Duplicate entries (same player, same date) are ignored and report 0 rows
+    return save_results_bulk([
+        (date, player_name, score, is_winner, streak_day, player_id, wordle_number)
+    ]) == 1
 
-    try:
-        c.execute('''
-            INSERT INTO results (date, player_name, score, is_winner, streak_day, player_id, wordle_number)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (date, player_name, score, is_winner, streak_day, player_id, wordle_number))
-        conn.commit()
-        conn.close()
-        return True
-    except sqlite3.IntegrityError:
-        # Duplicate entry (same player, same date)
-        conn.close()
-        return False
+
+def _prepare_rows(rows: List[tuple]) -> List[tuple]:
+    """
+    Turn (date, player_name, score, is_winner, streak_day, player_id, wordle_number)
+    tuples into INSERT parameters
+
+    Stores the weekday alongside each row so weekday queries can use an index,
+    and is_winner as a plain 0/1 integer.
+    """
+    weekdays = {date: _weekday(date) for date in {row[0] for row in rows}}
+    return [(date, player_name, score, int(is_winner), *rest, weekdays[date])
+            for date, player_name, score, is_winner, *rest in rows]
+
+
+def save_results_bulk(rows: List[tuple]) -> int:
+    """
+    Save many Wordle results in a single transaction
+
+    Args:
+        rows: List of (date, player_name, score, is_winner, streak_day,
+              player_id, wordle_number) tuples
+
+    Returns:
+        Number of rows inserted (duplicates are skipped)
+    """
+    if not rows:
+        return 0
+
+    rows = _prepare_rows(rows)
+    conn = get_conn()
+
+    # One transaction for the whole batch
+    with conn:
+        c = conn.executemany('''
+            INSERT OR IGNORE INTO results (date, player_name, score, is_winner, streak_day, player_id, wordle_number, weekday)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+        saved = c.rowcount
+
+    if saved:
+        clear_cache()
+    return saved
+
+
+def save_results_many(rows: List[tuple]) -> int:
+    """
+    Save a large batch of Wordle results, such as a channel backfill
+
+    Rows are inserted INSERT_CHUNK_SIZE at a time with multi-row VALUES
+    statements, so SQLite runs one statement per chunk instead of one per row.
+    All chunks share a single transaction.
+
+    Args:
+        rows: List of (date, player_name, score, is_winner, streak_day,
+              player_id, wordle_number) tuples
+
+    Returns:
+        Number of rows inserted (duplicates are skipped)
+    """
+    if not rows:
+        return 0
+
+    rows = _prepare_rows(rows)
+    conn = get_conn()
+    saved = 0
+
+    with conn:
+        for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+            chunk = rows[start:start + INSERT_CHUNK_SIZE]
+            c = conn.execute(
+                'INSERT OR IGNORE INTO results (date, player_name, score, is_winner, streak_day, player_id, wordle_number, weekday) '
+                'VALUES ' + ', '.join(['(?, ?, ?, ?, ?, ?, ?, ?)'] * len(chunk)),
+                [param for row in chunk for param in row]
+            )
+            saved += c.rowcount
+
+    if saved:
+        clear_cache()
+    return saved
+
+
+def get_data_version() -> int:
+    """
+    Get a cheap marker that changes whenever results are added
+
+    Returns:
+        The highest result id (0 for an empty database)
+    """
+    c = get_conn().cursor()
+
+    # MAX of the rowid alias is a single B-tree lookup
+    c.execute('SELECT MAX(id) FROM results')
+    version = c.fetchone()[0] or 0
+
+    c.close()
+    return version
 
 
 def get_leaderboard(limit: int = 10) -> List[Tuple[str, int]]:
     """
-    Get the wins leaderboard
+    Get the wins leaderboard (cached for CACHE_TTL seconds)
 
     Returns:
         List of (player_name, win_count) tuples
     """
-    conn = sqlite3.connect(DATABASE_PATH)
-    c = conn.cursor()
+    def query():
+        c = get_conn().cursor()
 
-    c.execute('''
-        SELECT player_name, COUNT(*) as wins
-        FROM results
-        WHERE is_winner = TRUE
-        GROUP BY player_name
-        ORDER BY wins DESC
-        LIMIT ?
-    ''', (limit,))
+        c.execute('''
+            SELECT player_name, COUNT(*) as wins
+            FROM results
+            WHERE is_winner = 1
+            GROUP BY player_name
+            ORDER BY wins DESC
+            LIMIT ?
+        ''', (limit,))
 
-    results = c.fetchall()
-    conn.close()
-    return results
+        results = c.fetchall()
+        c.close()
+        return results
 
+    return _cached(('leaderboard', limit), query)
 
-def get_player_stats(player_name: str) -> dict:
+
+def get_player_game_counts() -> List[Tuple[str, int]]:
     """
-    Get comprehensive stats for a single player
+    Get every player with their number of games played (cached for CACHE_TTL seconds)
 
     Returns:
-        Dictionary with various stats
+        List of (player_name, game_count) tuples, most games first
     """
-    conn = sqlite3.connect(DATABASE_PATH)
-    c = conn.cursor()
+    def query():
+        c = get_conn().cursor()
 
-    # Total games
-    c.execute('SELECT COUNT(*) FROM results WHERE player_name = ?', (player_name,))
-    total_games = c.fetchone()[0]
+        c.execute('''
+            SELECT player_name, COUNT(*) as games
+            FROM results
+            GROUP BY player_name
+            ORDER BY games DESC
+        ''')
 
-    if total_games == 0:
-        conn.close()
-        return None
+        results = c.fetchall()
+        c.close()
+        return results
+
+    return _cached(('player_game_counts',), query)
 
-    # Total wins
-    c.execute('SELECT COUNT(*) FROM results WHERE player_name = ? AND is_winner = TRUE',
-              (player_name,))
-    total_wins = c.fetchone()[0]
 
-    # Average score (excluding fails)
+def get_database_summary() -> Tuple[int, int, Optional[str], Optional[str], int]:
+    """
+    Get overall database statistics
+
+    Returns:
+        Tuple of (total_results, unique_players, first_date, latest_date, days_tracked)
+    """
+    c = get_conn().cursor()
+
+    # Everything comes out of a single pass over the table
     c.execute('''
-        SELECT AVG(score)
+        SELECT COUNT(*), COUNT(DISTINCT player_name), MIN(date), MAX(date), COUNT(DISTINCT date)
         FROM results
-        WHERE player_name = ? AND score < 7
-    ''', (player_name,))
-    avg_score = c.fetchone()[0]
+    ''')
 
-    # Fail count
-    c.execute('SELECT COUNT(*) FROM results WHERE player_name = ? AND score = 7',
-              (player_name,))
-    fail_count = c.fetchone()[0]
+    summary = c.fetchone()
+    c.close()
+    return summary
 
-    # Score distribution
-    c.execute('''
-        SELECT score, COUNT(*) as count
+
+def _player_stats(player_names: Tuple[str, ...]) -> Dict[str, dict]:
+    """
+    Get comprehensive stats for several players in one grouped query
+
+    Args:
+        player_names: Players to look up
+
+    Returns:
+        Dictionary mapping player name to stats; players with no games are left out
+    """
+    c = get_conn().cursor()
+
+    # All aggregates, including the score distribution, in a single pass
+    placeholders = ', '.join('?' * len(player_names))
+    c.execute(f'''
+        SELECT
+            player_name,
+            COUNT(*),
+            SUM(is_winner),
+            AVG(CASE WHEN score < 7 THEN score END),
+            SUM(score = 7),
+            MIN(CASE WHEN score < 7 THEN score END),
+            SUM(score = 1), SUM(score = 2), SUM(score = 3), SUM(score = 4),
+            SUM(score = 5), SUM(score = 6), SUM(score = 7)
         FROM results
-        WHERE player_name = ?
-        GROUP BY score
-        ORDER BY score
-    ''', (player_name,))
-    score_distribution = {row[0]: row[1] for row in c.fetchall()}
+        WHERE player_name IN ({placeholders})
+        GROUP BY player_name
+    ''', player_names)
+
+    rows = c.fetchall()
+    c.close()
+
+    stats = {}
+    for row in rows:
+        player_name, total_games, total_wins, avg_score, fail_count, best_score = row[:6]
+        stats[player_name] = {
+            'player_name': player_name,
+            'total_games': total_games,
+            'total_wins': total_wins,
+            'win_rate': total_wins / total_games * 100,
+            'avg_score': round(avg_score, 2) if avg_score else None,
+            'fail_count': fail_count,
+            'fail_rate': fail_count / total_games * 100,
+            'score_distribution': {score: count for score, count in enumerate(row[6:], 1) if count},
+            'best_score': best_score
+        }
+    return stats
 
-    # Best score
-    c.execute('SELECT MIN(score) FROM results WHERE player_name = ?', (player_name,))
-    best_score = c.fetchone()[0]
 
-    conn.close()
+def get_player_stats(player_name: str) -> dict:
+    """
+    Get comprehensive stats for a single player
 
-    return {
-        'player_name': player_name,
-        'total_games': total_games,
-        'total_wins': total_wins,
-        'win_rate': (total_wins / total_games * 100) if total_games > 0 else 0,
-        'avg_score': round(avg_score, 2) if avg_score else None,
-        'fail_count': fail_count,
-        'fail_rate': (fail_count / total_games * 100) if total_games > 0 else 0,
-        'score_distribution': score_distribution,
-        'best_score': best_score if best_score < 7 else None
-    }
+    Returns:
+        Dictionary with various stats
+    """
+    return _player_stats((player_name,)).get(player_name)
 
 
 def get_all_players_averages() -> List[Tuple[str, float, int]]:
@@ -168,8 +408,7 @@ def get_all_players_averages() -> List[Tuple[str, float, int]]:
     Returns:
         List of (player_name, avg_score, game_count) tuples
     """
-    conn = sqlite3.connect(DATABASE_PATH)
-    c = conn.cursor()
+    c = get_conn().cursor()
 
     c.execute('''
         SELECT
@@ -182,29 +421,34 @@ def get_all_players_averages() -> List[Tuple[str, float, int]]:
     ''')
 
     results = c.fetchall()
-    conn.close()
+    c.close()
     return results
 
 
-def get_recent_results(days: int = 7) -> List[dict]:
+def get_recent_results(days: int = 7) -> List[Result]:
     """
     Get results from the last N days
 
+    Args:
+        days: How many days back from today to include
+
     Returns:
-        List of result dictionaries
+        List of Result tuples, newest date first and best score first within a day
     """
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    c = conn.cursor()
+    c = get_conn().cursor()
 
+    # Range scan on idx_date_score instead of guessing a row count per day.
+    # Columns are listed explicitly since migrated tables may order them differently
     c.execute('''
-        SELECT * FROM results
-        ORDER BY date DESC
-        LIMIT ?
-    ''', (days * 10,))  # Assume ~10 players per day max
+        SELECT id, date, wordle_number, player_name, player_id,
+               score, is_winner, streak_day, created_at, weekday
+        FROM results
+        WHERE date >= date('now', ?)
+        ORDER BY date DESC, score ASC
+    ''', (f'-{days} days',))
 
-    results = [dict(row) for row in c.fetchall()]
-    conn.close()
+    results = list(map(Result._make, c.fetchall()))
+    c.close()
     return results
 
 
@@ -215,40 +459,37 @@ def get_head_to_head(player1: str, player2: str) -> dict:
     Returns:
         Dictionary with comparison stats
     """
-    p1_stats = get_player_stats(player1)
-    p2_stats = get_player_stats(player2)
+    # Both players' stats from one grouped query
+    stats = _player_stats((player1, player2))
+    p1_stats = stats.get(player1)
+    p2_stats = stats.get(player2)
 
     if not p1_stats or not p2_stats:
         return None
 
-    conn = sqlite3.connect(DATABASE_PATH)
-    c = conn.cursor()
+    c = get_conn().cursor()
 
-    # Get days where both played
+    # Count matchups on days both played; only the totals leave SQLite
     c.execute('''
         SELECT
-            r1.date,
-            r1.score as p1_score,
-            r2.score as p2_score
+            COUNT(*),
+            COALESCE(SUM(r1.score < r2.score), 0),
+            COALESCE(SUM(r2.score < r1.score), 0),
+            COALESCE(SUM(r1.score = r2.score), 0)
         FROM results r1
         INNER JOIN results r2 ON r1.date = r2.date
         WHERE r1.player_name = ? AND r2.player_name = ?
-        ORDER BY r1.date DESC
     ''', (player1, player2))
 
-    matchups = c.fetchall()
-    conn.close()
-
-    p1_wins = sum(1 for _, p1_score, p2_score in matchups if p1_score < p2_score)
-    p2_wins = sum(1 for _, p1_score, p2_score in matchups if p2_score < p1_score)
-    ties = sum(1 for _, p1_score, p2_score in matchups if p1_score == p2_score)
+    matchups, p1_wins, p2_wins, ties = c.fetchone()
+    c.close()
 
     return {
         'player1': player1,
         'player2': player2,
         'p1_stats': p1_stats,
         'p2_stats': p2_stats,
-        'matchups': len(matchups),
+        'matchups': matchups,
         'p1_wins': p1_wins,
         'p2_wins': p2_wins,
         'ties': ties
@@ -262,8 +503,7 @@ def get_streak_info() -> dict:
     Returns:
         Dictionary with streak stats
     """
-    conn = sqlite3.connect(DATABASE_PATH)
-    c = conn.cursor()
+    c = get_conn().cursor()
 
     # Get most recent streak
     c.execute('SELECT streak_day FROM results ORDER BY date DESC LIMIT 1')
@@ -274,7 +514,7 @@ def get_streak_info() -> dict:
     c.execute('SELECT MAX(streak_day) FROM results')
     best_streak = c.fetchone()[0] or 0
 
-    conn.close()
+    c.close()
 
     return {
         'current_streak': current_streak,
@@ -289,8 +529,7 @@ def get_lucky_players() -> List[Tuple[str, int]]:
     Returns:
         List of (player_name, lucky_count) tuples
     """
-    conn = sqlite3.connect(DATABASE_PATH)
-    c = conn.cursor()
+    c = get_conn().cursor()
 
     c.execute('''
         SELECT player_name, COUNT(*) as lucky_count
@@ -301,7 +540,7 @@ def get_lucky_players() -> List[Tuple[str, int]]:
     ''')
 
     results = c.fetchall()
-    conn.close()
+    c.close()
     return results
 
 
@@ -312,28 +551,37 @@ def get_weekday_winners() -> dict:
     Returns:
         Dictionary mapping weekday to (player_name, win_count)
     """
-    conn = sqlite3.connect(DATABASE_PATH)
-    c = conn.cursor()
+    c = get_conn().cursor()
 
-    weekday_stats = {}
+    # Rank players within each weekday and keep the top one, all in one scan
+    c.execute('''
+        WITH weekday_wins AS (
+            SELECT
+                weekday,
+                player_name,
+                COUNT(*) as wins,
+                ROW_NUMBER() OVER (PARTITION BY weekday ORDER BY COUNT(*) DESC) as rank
+            FROM results
+            WHERE is_winner = 1
+            GROUP BY weekday, player_name
+        )
+        SELECT weekday, player_name, wins
+        FROM weekday_wins
+        WHERE rank = 1
+    ''')
+
+    top_by_weekday = {weekday: (player_name, wins) for weekday, player_name, wins in c.fetchall()}
+    c.close()
+
+    # The weekday column numbers days from Sunday = 0
     weekdays = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+    weekday_stats = {}
 
     for i, weekday in enumerate(weekdays):
-        c.execute('''
-            SELECT player_name, COUNT(*) as wins
-            FROM results
-            WHERE is_winner = TRUE
-            AND CAST(strftime('%w', date) AS INTEGER) = ?
-            GROUP BY player_name
-            ORDER BY wins DESC
-            LIMIT 1
-        ''', (i,))
-
-        result = c.fetchone()
-        if result:
-            weekday_stats[weekday] = result
+        top = top_by_weekday.get((i + 1) % 7)
+        if top:
+            weekday_stats[weekday] = top
 
-    conn.close()
     return weekday_stats
 
 
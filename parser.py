@@ -5,7 +5,18 @@ Message parsing logic for Wordle bot results
 import re
 from datetime import datetime, timedelta
 from typing import List, Tuple, Optional
-from config import CROWN_EMOJI, SCORE_PATTERN, STREAK_PATTERN, FAIL_SCORE
+from config import CROWN_EMOJI, STREAK_RE, FAIL_SCORE
+
+# Patterns compiled once at import instead of on every parsed message
+_WORDLE_NUMBER_RES = [re.compile(p, re.IGNORECASE) for p in (
+    r'Wordle\s+(\d+)',    # "Wordle 1234"
+    r'#(\d+)',             # "#1234"
+    r'puzzle\s+(\d+)',    # "puzzle 1234"
+)]
+_SCORE_RE = re.compile(r'([X\d])/6')
+_DISCORD_MENTION_RE = re.compile(r'<@!?(\d+)>')
+_TEXT_MENTION_RE = re.compile(r'(?<![<@])@([\w.]+)(?!>)')
+_SPLIT_RE = re.compile(r'(?=[👑]?\s*[X\d]/6:)')
 
 class WordleResult:
     """
@@ -23,7 +34,7 @@ class WordleResult:
         return f"{winner_mark}{self.player_name}: {self.score}/6"
 
 def extract_streak(message : str) -> Optional[int]:
-    match = re.search(STREAK_PATTERN, message)
+    match = STREAK_RE.search(message)
     if match:
         return int(match.group(1))
     return None
@@ -39,15 +50,8 @@ def extract_wordle_number(message: str) -> Optional[int]:
     Returns:
         Wordle number or None if not found
     """
-    # Pattern: "Wordle 1234" or "#1234"
-    patterns = [
-        r'Wordle\s+(\d+)',
-        r'#(\d+)',
-        r'puzzle\s+(\d+)'
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, message, re.IGNORECASE)
+    for pattern in _WORDLE_NUMBER_RES:
+        match = pattern.search(message)
         if match:
             return int(match.group(1))
     return None
@@ -87,7 +91,7 @@ def parse_score_line(line: str) -> List[WordleResult]:
     is_winner = CROWN_EMOJI in line
 
     # Extract score (N/6 or X/6)
-    score_match = re.search(r'([X\d])/6', line)
+    score_match = _SCORE_RE.search(line)
     if not score_match:
         return results
 
@@ -99,10 +103,10 @@ def parse_score_line(line: str) -> List[WordleResult]:
     # 2. Discord mentions: <@123456789> or <@!123456789>
 
     # First try Discord user ID mentions (more common)
-    discord_mentions = re.findall(r'<@!?(\d+)>', line)
+    discord_mentions = _DISCORD_MENTION_RE.findall(line)
 
     # Then try plain text mentions
-    text_mentions = re.findall(r'(?<![<@])@([\w.]+)(?!>)', line)
+    text_mentions = _TEXT_MENTION_RE.findall(line)
 
     # Combine both - use IDs if available, otherwise use text mentions
     all_mentions = discord_mentions if discord_mentions else text_mentions
@@ -132,8 +136,14 @@ def parse_wordle_message(message: str) -> Tuple[List[WordleResult], Optional[int
     Returns:
         Tuple of (results_list, streak_number, wordle_number)
     """
+    # Every results message has at least one score; skip chat noise before
+    # doing any lowercasing, splitting or regex work
+    if '/6' not in message:
+        return [], None, None
+
     # Check if this is a valid Wordle results message
-    if 'streak' not in message.lower() and 'results' not in message.lower():
+    message_lower = message.lower()
+    if 'streak' not in message_lower and 'results' not in message_lower:
         return [], None, None
 
     results = []
@@ -153,9 +163,9 @@ def parse_wordle_message(message: str) -> Tuple[List[WordleResult], Optional[int
 
     # If multi-line didn't work, try parsing as single line
     # This handles: "4/6: @user1 5/6: @user2 X/6: @user3"
-    if not results and '/6' in message:
+    if not results:
         # Split by score patterns
-        score_segments = re.split(r'(?=[👑]?\s*[X\d]/6:)', message)
+        score_segments = _SPLIT_RE.split(message)
 
         for segment in score_segments:
             if '/6' in segment:
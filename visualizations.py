@@ -4,11 +4,118 @@ Chart generation for Wordle stats
 import matplotlib.pyplot as plt
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend for Discord bot
+from matplotlib.figure import Figure
+import asyncio
+import functools
 import io
-from typing import List, Tuple, Optional
+import numpy as np
+import threading
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Tuple, Optional
 import database
 
+# Seconds a rendered chart is reused for the same data
+CHART_CACHE_TTL = 300
 
+# Rendered charts: (function name, args, data version) -> (rendered_at, PNG bytes)
+_chart_cache: Dict[tuple, Tuple[float, bytes]] = {}
+
+# PNG export settings shared by every chart. Discord downscales images in the
+# client, so 100 dpi is plenty, and zlib level 1 encodes much faster than the default
+_SAVE_KWARGS = dict(format='png', dpi=100, bbox_inches='tight',
+                    pil_kwargs={'compress_level': 1})
+
+# Single figure reused by every chart instead of creating and closing one per call
+_fig = Figure()
+
+# Charts render in worker threads, so only one may draw on _fig at a time
+_render_lock = threading.Lock()
+
+# Name the bundled font directly so text layout doesn't walk the sans-serif fallback list
+matplotlib.rcParams['font.family'] = 'DejaVu Sans'
+
+
+def _warm_up():
+    """Render a throwaway figure so font loading happens at import, not on the first chart"""
+    fig = Figure(figsize=(1, 1))
+    fig.text(0.5, 0.5, '.')
+    fig.text(0.5, 0.5, '.', fontweight='bold')  # Titles and labels use the bold face
+    fig.savefig(io.BytesIO(), format='png')
+
+
+_warm_up()
+
+
+def _subplots(figsize: Tuple[float, float], ncols: int = 1):
+    """
+    Clear the shared figure, resize it and add fresh axes
+
+    Args:
+        figsize: Figure size in inches
+        ncols: Number of side-by-side axes
+
+    Returns:
+        Tuple of (figure, axes) like plt.subplots
+    """
+    _fig.clear()
+    _fig.set_size_inches(figsize)
+    # Undo any spacing left behind by the previous chart's tight_layout()
+    _fig.subplots_adjust(**{k: matplotlib.rcParams[f'figure.subplot.{k}']
+                            for k in ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')})
+    return _fig, _fig.subplots(1, ncols)
+
+
+def _columns(rows: List[tuple], *dtypes) -> Tuple[np.ndarray, ...]:
+    """
+    Split query rows into one NumPy array per column
+
+    Args:
+        rows: Rows from a database query
+        dtypes: dtype for each leading column to extract
+
+    Returns:
+        Tuple of arrays, one per dtype
+    """
+    return tuple(np.fromiter((row[i] for row in rows), dtype=dtype, count=len(rows))
+                 for i, dtype in enumerate(dtypes))
+
+
+def _cached_chart(fn: Callable[..., io.BytesIO]) -> Callable[..., io.BytesIO]:
+    """
+    Cache a chart function's PNG output until the results data changes
+
+    Charts are keyed by their arguments and database.get_data_version(), so
+    repeated requests between Wordle posts skip the query and rendering.
+    Bytes are stored rather than the BytesIO, which can't be handed out twice.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        version = database.get_data_version()
+        key = (fn.__name__, args, tuple(sorted(kwargs.items())), version)
+
+        # Held across the lookup too, so concurrent requests for the same chart render it once
+        with _render_lock:
+            now = time.monotonic()
+
+            hit = _chart_cache.get(key)
+            if hit is not None and now - hit[0] < CHART_CACHE_TTL:
+                return io.BytesIO(hit[1])
+
+            buf = fn(*args, **kwargs)
+
+            # Drop charts rendered from older data or past their TTL
+            for stale in [k for k, (rendered_at, _) in _chart_cache.items()
+                          if k[-1] != version or now - rendered_at >= CHART_CACHE_TTL]:
+                del _chart_cache[stale]
+
+            _chart_cache[key] = (now, buf.getvalue())
+            return buf
+
+    return wrapper
+
+
+@_cached_chart
 def create_wins_leaderboard_chart(limit: int = 10) -> io.BytesIO:
     """
     Create a horizontal bar chart showing wins leaderboard
@@ -23,18 +130,17 @@ def create_wins_leaderboard_chart(limit: int = 10) -> io.BytesIO:
 
     if not data:
         # Create empty chart
-        fig, ax = plt.subplots(figsize=(10, 6))
+        fig, ax = _subplots((10, 6))
         ax.text(0.5, 0.5, 'No data available yet', ha='center', va='center', fontsize=14)
         ax.set_xlim(0, 1)
         ax.set_ylim(0, 1)
         ax.axis('off')
     else:
-        players = [row[0] for row in data]
-        wins = [row[1] for row in data]
+        players, wins = _columns(data, object, np.int64)
 
         # Create horizontal bar chart
-        fig, ax = plt.subplots(figsize=(10, max(6, len(players) * 0.5)))
-        colors = plt.cm.viridis([i / len(players) for i in range(len(players))])
+        fig, ax = _subplots((10, max(6, len(players) * 0.5)))
+        colors = plt.cm.viridis(np.arange(len(players)) / len(players))
         bars = ax.barh(players, wins, color=colors)
 
         # Add value labels on bars
@@ -53,17 +159,17 @@ def create_wins_leaderboard_chart(limit: int = 10) -> io.BytesIO:
         ax.set_title('Wordle Wins Leaderboard', fontsize=16, fontweight='bold', pad=20)
         ax.spines['top'].set_visible(False)
         ax.spines['right'].set_visible(False)
-        plt.tight_layout()
+        fig.tight_layout()
 
     # Save to BytesIO
     buf = io.BytesIO()
-    plt.savefig(buf, format='png', dpi=150, bbox_inches='tight')
+    fig.savefig(buf, **_SAVE_KWARGS)
     buf.seek(0)
-    plt.close(fig)
 
     return buf
 
 
+@_cached_chart
 def create_participation_chart() -> io.BytesIO:
     """
     Create a chart showing how many days each player has participated
@@ -71,52 +177,50 @@ def create_participation_chart() -> io.BytesIO:
     Returns:
         BytesIO object containing the chart image
     """
-    # Get participation data from database
-    import sqlite3
-    conn = sqlite3.connect(database.DATABASE_PATH)
-    c = conn.cursor()
+    # Get participation data and the overall date range in one query; separate
+    # MIN/MAX subqueries each read one end of the date index instead of scanning it.
+    # (date, player_name) is UNIQUE, so COUNT(*) per player already counts distinct days
+    c = database.get_conn().cursor()
 
     c.execute('''
-        SELECT player_name, COUNT(DISTINCT date) as days_played
+        SELECT
+            player_name,
+            COUNT(*) as days_played,
+            (SELECT MIN(date) FROM results),
+            (SELECT MAX(date) FROM results)
         FROM results
         GROUP BY player_name
         ORDER BY days_played DESC
     ''')
 
     data = c.fetchall()
-    conn.close()
+    c.close()
+
+    # Total possible days runs from the earliest to latest date in the database
+    min_date, max_date = data[0][2:] if data else (None, None)
 
     if not data:
-        fig, ax = plt.subplots(figsize=(10, 6))
+        fig, ax = _subplots((10, 6))
         ax.text(0.5, 0.5, 'No data available yet', ha='center', va='center', fontsize=14)
         ax.set_xlim(0, 1)
         ax.set_ylim(0, 1)
         ax.axis('off')
     else:
-        players = [row[0] for row in data]
-        days_played = [row[1] for row in data]
-
-        # Get total possible days (from earliest to latest date in database)
-        conn = sqlite3.connect(database.DATABASE_PATH)
-        c = conn.cursor()
-        c.execute('SELECT MIN(date), MAX(date) FROM results')
-        min_date, max_date = c.fetchone()
-        conn.close()
+        players, days_played = _columns(data, object, np.int64)
 
         if min_date and max_date:
-            from datetime import datetime
             start = datetime.strptime(min_date, '%Y-%m-%d')
             end = datetime.strptime(max_date, '%Y-%m-%d')
             total_days = (end - start).days + 1
         else:
-            total_days = max(days_played) if days_played else 0
+            total_days = days_played.max()
 
         # Create horizontal bar chart
-        fig, ax = plt.subplots(figsize=(10, max(6, len(players) * 0.5)))
+        fig, ax = _subplots((10, max(6, len(players) * 0.5)))
 
         # Color based on participation rate
-        participation_rates = [d / total_days for d in days_played]
-        colors = plt.cm.RdYlGn([rate for rate in participation_rates])
+        participation_rates = days_played / total_days
+        colors = plt.cm.RdYlGn(participation_rates)
         bars = ax.barh(players, days_played, color=colors)
 
         # Add value labels with participation percentage
@@ -132,16 +236,16 @@ def create_participation_chart() -> io.BytesIO:
         ax.set_xlim(0, total_days * 1.15)  # Add some padding for labels
         ax.spines['top'].set_visible(False)
         ax.spines['right'].set_visible(False)
-        plt.tight_layout()
+        fig.tight_layout()
 
     buf = io.BytesIO()
-    plt.savefig(buf, format='png', dpi=150, bbox_inches='tight')
+    fig.savefig(buf, **_SAVE_KWARGS)
     buf.seek(0)
-    plt.close(fig)
 
     return buf
 
 
+@_cached_chart
 def create_average_scores_chart() -> io.BytesIO:
     """
     Create a bar chart comparing average scores
@@ -152,21 +256,21 @@ def create_average_scores_chart() -> io.BytesIO:
     data = database.get_all_players_averages()
 
     if not data:
-        fig, ax = plt.subplots(figsize=(10, 6))
+        fig, ax = _subplots((10, 6))
         ax.text(0.5, 0.5, 'No data available yet', ha='center', va='center', fontsize=14)
         ax.set_xlim(0, 1)
         ax.set_ylim(0, 1)
         ax.axis('off')
     else:
-        players = [row[0] for row in data if row[1] is not None]
-        averages = [row[1] for row in data if row[1] is not None]
-        game_counts = [row[2] for row in data if row[1] is not None]
+        # Players who have only failed have no average
+        players, averages, game_counts = _columns(
+            [row for row in data if row[1] is not None], object, np.float64, np.int64)
 
         # Create bar chart
-        fig, ax = plt.subplots(figsize=(10, max(6, len(players) * 0.5)))
+        fig, ax = _subplots((10, max(6, len(players) * 0.5)))
 
         # Color bars based on average (lower is better, so reverse colors)
-        colors = plt.cm.RdYlGn_r([i / len(players) for i in range(len(players))])
+        colors = plt.cm.RdYlGn_r(np.arange(len(players)) / len(players))
         bars = ax.barh(players, averages, color=colors)
 
         # Add value labels
@@ -178,19 +282,19 @@ def create_average_scores_chart() -> io.BytesIO:
 
         ax.set_xlabel('Average Score (lower is better)', fontsize=12, fontweight='bold')
         ax.set_title('Average Wordle Scores', fontsize=16, fontweight='bold', pad=20)
-        ax.set_xlim(0, max(averages) * 1.2 if averages else 6)
+        ax.set_xlim(0, averages.max() * 1.2 if averages.size else 6)
         ax.spines['top'].set_visible(False)
         ax.spines['right'].set_visible(False)
-        plt.tight_layout()
+        fig.tight_layout()
 
     buf = io.BytesIO()
-    plt.savefig(buf, format='png', dpi=150, bbox_inches='tight')
+    fig.savefig(buf, **_SAVE_KWARGS)
     buf.seek(0)
-    plt.close(fig)
 
     return buf
 
 
+@_cached_chart
 def create_score_distribution_chart(player_name: str) -> io.BytesIO:
     """
     Create a stacked bar chart showing score distribution for a player
@@ -204,7 +308,7 @@ def create_score_distribution_chart(player_name: str) -> io.BytesIO:
     stats = database.get_player_stats(player_name)
 
     if not stats or not stats['score_distribution']:
-        fig, ax = plt.subplots(figsize=(10, 6))
+        fig, ax = _subplots((10, 6))
         ax.text(0.5, 0.5, f'No data available for {player_name}',
                ha='center', va='center', fontsize=14)
         ax.set_xlim(0, 1)
@@ -213,28 +317,22 @@ def create_score_distribution_chart(player_name: str) -> io.BytesIO:
     else:
         dist = stats['score_distribution']
 
-        # Prepare data
-        scores = []
-        counts = []
-        labels = []
-
-        for score in range(1, 8):  # 1-6 and 7 (fail)
-            count = dist.get(score, 0)
-            if count > 0:
-                scores.append(score)
-                counts.append(count)
-                labels.append('X' if score == 7 else str(score))
+        # Prepare data: scores 1-6 and 7 (fail) that occurred at least once
+        scores = np.array(sorted(dist))
+        counts = np.array([dist[score] for score in scores])
+        labels = np.where(scores == 7, 'X', scores.astype(str))
+        percents = counts / stats['total_games'] * 100
 
         # Create bar chart
-        fig, ax = plt.subplots(figsize=(10, 6))
-        colors = ['#538d4e', '#6aaa64', '#b59f3b', '#c9b458', '#edcc61', '#f5793a', '#d73027']
-        bars = ax.bar(labels, counts, color=[colors[s-1] for s in scores])
+        fig, ax = _subplots((10, 6))
+        colors = np.array(['#538d4e', '#6aaa64', '#b59f3b', '#c9b458', '#edcc61', '#f5793a', '#d73027'])
+        bars = ax.bar(labels, counts, color=colors[scores - 1])
 
         # Add value labels
-        for bar, count in zip(bars, counts):
+        for bar, count, percent in zip(bars, counts, percents):
             height = bar.get_height()
             ax.text(bar.get_x() + bar.get_width()/2, height,
-                   f'{count}\n({count/stats["total_games"]*100:.1f}%)',
+                   f'{count}\n({percent:.1f}%)',
                    ha='center', va='bottom', fontsize=10)
 
         ax.set_xlabel('Score', fontsize=12, fontweight='bold')
@@ -243,16 +341,16 @@ def create_score_distribution_chart(player_name: str) -> io.BytesIO:
                     fontsize=16, fontweight='bold', pad=20)
         ax.spines['top'].set_visible(False)
         ax.spines['right'].set_visible(False)
-        plt.tight_layout()
+        fig.tight_layout()
 
     buf = io.BytesIO()
-    plt.savefig(buf, format='png', dpi=150, bbox_inches='tight')
+    fig.savefig(buf, **_SAVE_KWARGS)
     buf.seek(0)
-    plt.close(fig)
 
     return buf
 
 
+@_cached_chart
 def create_head_to_head_chart(player1: str, player2: str) -> io.BytesIO:
     """
     Create a comparison chart for two players
@@ -267,7 +365,7 @@ def create_head_to_head_chart(player1: str, player2: str) -> io.BytesIO:
     h2h = database.get_head_to_head(player1, player2)
 
     if not h2h:
-        fig, ax = plt.subplots(figsize=(10, 6))
+        fig, ax = _subplots((10, 6))
         ax.text(0.5, 0.5, 'Not enough data for comparison',
                ha='center', va='center', fontsize=14)
         ax.set_xlim(0, 1)
@@ -275,7 +373,7 @@ def create_head_to_head_chart(player1: str, player2: str) -> io.BytesIO:
         ax.axis('off')
     else:
         # Create figure with subplots
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+        fig, (ax1, ax2) = _subplots((14, 6), ncols=2)
 
         # Left plot: Win comparison in head-to-head matchups
         matchup_labels = [player1, 'Ties', player2]
@@ -292,23 +390,23 @@ def create_head_to_head_chart(player1: str, player2: str) -> io.BytesIO:
 
         # Right plot: Overall stats comparison
         stats_labels = ['Win Rate %', 'Avg Score', 'Fail Rate %']
-        p1_stats_values = [
+        p1_stats_values = np.array([
             h2h['p1_stats']['win_rate'],
             h2h['p1_stats']['avg_score'] or 0,
             h2h['p1_stats']['fail_rate']
-        ]
-        p2_stats_values = [
+        ])
+        p2_stats_values = np.array([
             h2h['p2_stats']['win_rate'],
             h2h['p2_stats']['avg_score'] or 0,
             h2h['p2_stats']['fail_rate']
-        ]
+        ])
 
-        x = range(len(stats_labels))
+        x = np.arange(len(stats_labels))
         width = 0.35
 
-        ax2.bar([i - width/2 for i in x], p1_stats_values, width,
+        ax2.bar(x - width/2, p1_stats_values, width,
                label=player1, color='#3498db')
-        ax2.bar([i + width/2 for i in x], p2_stats_values, width,
+        ax2.bar(x + width/2, p2_stats_values, width,
                label=player2, color='#e74c3c')
 
         ax2.set_ylabel('Value', fontsize=12, fontweight='bold')
@@ -325,16 +423,16 @@ def create_head_to_head_chart(player1: str, player2: str) -> io.BytesIO:
             ax1.spines[spine].set_visible(False)
             ax2.spines[spine].set_visible(False)
 
-        plt.tight_layout()
+        fig.tight_layout()
 
     buf = io.BytesIO()
-    plt.savefig(buf, format='png', dpi=150, bbox_inches='tight')
+    fig.savefig(buf, **_SAVE_KWARGS)
     buf.seek(0)
-    plt.close(fig)
 
     return buf
 
 
+@_cached_chart
 def create_luck_chart(limit: int = 10) -> io.BytesIO:
     """
     Create a chart showing who gets the most lucky scores (1/6 and 2/6)
@@ -348,18 +446,17 @@ def create_luck_chart(limit: int = 10) -> io.BytesIO:
     data = database.get_lucky_players()
 
     if not data:
-        fig, ax = plt.subplots(figsize=(10, 6))
+        fig, ax = _subplots((10, 6))
         ax.text(0.5, 0.5, 'No lucky scores yet!', ha='center', va='center', fontsize=14)
         ax.set_xlim(0, 1)
         ax.set_ylim(0, 1)
         ax.axis('off')
     else:
-        players = [row[0] for row in data[:limit]]
-        lucky_counts = [row[1] for row in data[:limit]]
+        players, lucky_counts = _columns(data[:limit], object, np.int64)
 
         # Create bar chart
-        fig, ax = plt.subplots(figsize=(10, max(6, len(players) * 0.5)))
-        colors = plt.cm.YlOrRd([i / len(players) for i in range(len(players))])
+        fig, ax = _subplots((10, max(6, len(players) * 0.5)))
+        colors = plt.cm.YlOrRd(np.arange(len(players)) / len(players))
         bars = ax.barh(players, lucky_counts, color=colors)
 
         # Add value labels
@@ -370,18 +467,40 @@ def create_luck_chart(limit: int = 10) -> io.BytesIO:
                    ha='left', va='center', fontweight='bold')
 
         # Add trophy for top player
-        if players:
+        if players.size:
             ax.text(-0.5, 0, '🍀', ha='right', va='center', fontsize=20)
 
         ax.set_xlabel('Lucky Scores (1/6 or 2/6)', fontsize=12, fontweight='bold')
         ax.set_title('Luckiest Players', fontsize=16, fontweight='bold', pad=20)
         ax.spines['top'].set_visible(False)
         ax.spines['right'].set_visible(False)
-        plt.tight_layout()
+        fig.tight_layout()
 
     buf = io.BytesIO()
-    plt.savefig(buf, format='png', dpi=150, bbox_inches='tight')
+    fig.savefig(buf, **_SAVE_KWARGS)
     buf.seek(0)
-    plt.close(fig)
 
     return buf
+
+
+def _async_chart(fn: Callable[..., io.BytesIO]) -> Callable[..., Awaitable[io.BytesIO]]:
+    """
+    Wrap a chart function so it renders in a worker thread
+
+    Rendering takes long enough to stall the Discord heartbeat if run on the
+    event loop, so commands await these variants instead.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+    wrapper.__name__ = wrapper.__qualname__ = f'{fn.__name__}_async'
+    return wrapper
+
+
+create_wins_leaderboard_chart_async = _async_chart(create_wins_leaderboard_chart)
+create_participation_chart_async = _async_chart(create_participation_chart)
+create_average_scores_chart_async = _async_chart(create_average_scores_chart)
+create_score_distribution_chart_async = _async_chart(create_score_distribution_chart)
+create_head_to_head_chart_async = _async_chart(create_head_to_head_chart)
+create_luck_chart_async = _async_chart(create_luck_chart)